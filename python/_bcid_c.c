@@ -0,0 +1,246 @@
+/*
+ * Optional C accelerator for bcid.py.
+ *
+ * Provides drop-in replacements for the base62 primitives used on the generate and decode
+ * paths (base62_encode and base62_decode). Values that fit in 64 bits are handled with plain
+ * uint64_t arithmetic; larger values are processed in 10-digit chunks.
+ * bcid.py falls back to its pure-Python versions when this extension is not built.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+
+// Base62 alphabet (a-zA-Z0-9)
+static const char BASE62[] = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789";
+
+// 62**10, the largest power of 62 below 2**64
+#define CHUNK_DIGITS 10
+#define CHUNK_VALUE 839299365868340224ULL
+
+// Reverse lookup: byte value -> digit value (0xFF marks invalid characters)
+static uint8_t B62_DECODE[256];
+
+// Write num in base62 right-to-left, ending just before end. With fixed set, exactly
+// CHUNK_DIGITS digits are written (zero-padded); otherwise the minimal number of digits.
+static char *encode_u64(uint64_t num, char *end, int fixed) {
+    char *p = end;
+    do {
+        *--p = BASE62[num % 62];
+        num /= 62;
+    } while (fixed ? (end - p) < CHUNK_DIGITS : num != 0);
+    return p;
+}
+
+// Append a chunk to a growable array, returning -1 with MemoryError set on failure
+static int push_chunk(uint64_t **chunks, Py_ssize_t *count, Py_ssize_t *capacity, uint64_t value) {
+    if (*count == *capacity) {
+        Py_ssize_t grown_capacity = *capacity ? *capacity * 2 : 8;
+        uint64_t *grown = PyMem_Realloc(*chunks, grown_capacity * sizeof(uint64_t));
+        if (!grown) {
+            PyErr_NoMemory();
+            return -1;
+        }
+        *chunks = grown;
+        *capacity = grown_capacity;
+    }
+    (*chunks)[(*count)++] = value;
+    return 0;
+}
+
+// Encode a non-negative int that does not fit in 64 bits, one 10-digit chunk at a time
+static PyObject *encode_big(PyObject *num) {
+    PyObject *divisor = PyLong_FromUnsignedLongLong(CHUNK_VALUE);
+    if (!divisor) {
+        return NULL;
+    }
+
+    uint64_t *chunks = NULL;
+    Py_ssize_t count = 0, capacity = 0;
+    PyObject *result = NULL;
+    PyObject *quotient = Py_NewRef(num);
+
+    // Collect chunks least significant first; once the remaining value fits in 64 bits the
+    // last split is done in C, leaving a top chunk below 62**10
+    for (;;) {
+        uint64_t top = PyLong_AsUnsignedLongLong(quotient);
+        if (!(top == (uint64_t)-1 && PyErr_Occurred())) {
+            if (top >= CHUNK_VALUE) {
+                if (push_chunk(&chunks, &count, &capacity, top % CHUNK_VALUE) < 0) {
+                    goto done;
+                }
+                top /= CHUNK_VALUE;
+            }
+            if (push_chunk(&chunks, &count, &capacity, top) < 0) {
+                goto done;
+            }
+            break;
+        }
+        if (!PyErr_ExceptionMatches(PyExc_OverflowError)) {
+            goto done;
+        }
+        PyErr_Clear();
+
+        PyObject *pair = PyNumber_Divmod(quotient, divisor);
+        if (!pair) {
+            goto done;
+        }
+        uint64_t rem = PyLong_AsUnsignedLongLong(PyTuple_GET_ITEM(pair, 1));
+        Py_SETREF(quotient, Py_NewRef(PyTuple_GET_ITEM(pair, 0)));
+        Py_DECREF(pair);
+        if (push_chunk(&chunks, &count, &capacity, rem) < 0) {
+            goto done;
+        }
+    }
+
+    // The most significant chunk is written unpadded, every other chunk as exactly 10 digits
+    Py_ssize_t size = count * CHUNK_DIGITS;
+    char *buf = PyMem_Malloc(size);
+    if (!buf) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    char *p = buf + size;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        p = encode_u64(chunks[i], p, i != count - 1);
+    }
+    result = PyUnicode_DecodeASCII(p, buf + size - p, NULL);
+    PyMem_Free(buf);
+
+done:
+    PyMem_Free(chunks);
+    Py_DECREF(quotient);
+    Py_DECREF(divisor);
+    return result;
+}
+
+static PyObject *base62_encode(PyObject *Py_UNUSED(module), PyObject *num) {
+    if (!PyLong_Check(num)) {
+        PyErr_Format(PyExc_TypeError, "base62_encode expects an int, got %.200s", Py_TYPE(num)->tp_name);
+        return NULL;
+    }
+
+    uint64_t value = PyLong_AsUnsignedLongLong(num);
+    if (value == (uint64_t)-1 && PyErr_Occurred()) {
+        if (!PyErr_ExceptionMatches(PyExc_OverflowError)) {
+            return NULL;
+        }
+        PyErr_Clear();
+
+        PyObject *zero = PyLong_FromLong(0);
+        if (!zero) {
+            return NULL;
+        }
+        int negative = PyObject_RichCompareBool(num, zero, Py_LT);
+        Py_DECREF(zero);
+        if (negative < 0) {
+            return NULL;
+        }
+        if (negative) {
+            PyErr_SetString(PyExc_ValueError, "base62_encode expects a non-negative int");
+            return NULL;
+        }
+        return encode_big(num);
+    }
+
+    char buf[16];
+    char *start = encode_u64(value, buf + sizeof(buf), 0);
+    return PyUnicode_DecodeASCII(start, buf + sizeof(buf) - start, NULL);
+}
+
+static PyObject *invalid_base62(PyObject *s) {
+    PyErr_Format(PyExc_ValueError, "Invalid base62 string: %R", s);
+    return NULL;
+}
+
+static PyObject *base62_decode(PyObject *Py_UNUSED(module), PyObject *s) {
+    if (!PyUnicode_Check(s)) {
+        PyErr_Format(PyExc_TypeError, "base62_decode expects a str, got %.200s", Py_TYPE(s)->tp_name);
+        return NULL;
+    }
+    if (!PyUnicode_IS_ASCII(s)) {
+        return invalid_base62(s);
+    }
+
+    const uint8_t *data = PyUnicode_1BYTE_DATA(s);
+    Py_ssize_t len = PyUnicode_GET_LENGTH(s);
+
+    // The leading partial chunk makes every following chunk exactly 10 digits long
+    Py_ssize_t head = len % CHUNK_DIGITS;
+    if (head == 0 && len > 0) {
+        head = CHUNK_DIGITS;
+    }
+
+    uint64_t value = 0;
+    for (Py_ssize_t i = 0; i < head; i++) {
+        uint8_t digit = B62_DECODE[data[i]];
+        if (digit == 0xFF) {
+            return invalid_base62(s);
+        }
+        value = value * 62 + digit;
+    }
+    if (head == len) {
+        return PyLong_FromUnsignedLongLong(value);
+    }
+
+    PyObject *result = PyLong_FromUnsignedLongLong(value);
+    PyObject *multiplier = PyLong_FromUnsignedLongLong(CHUNK_VALUE);
+    if (!result || !multiplier) {
+        goto error;
+    }
+    for (Py_ssize_t i = head; i < len; i += CHUNK_DIGITS) {
+        uint64_t chunk = 0;
+        for (Py_ssize_t j = i; j < i + CHUNK_DIGITS; j++) {
+            uint8_t digit = B62_DECODE[data[j]];
+            if (digit == 0xFF) {
+                invalid_base62(s);
+                goto error;
+            }
+            chunk = chunk * 62 + digit;
+        }
+
+        PyObject *chunk_obj = PyLong_FromUnsignedLongLong(chunk);
+        if (!chunk_obj) {
+            goto error;
+        }
+        PyObject *shifted = PyNumber_Multiply(result, multiplier);
+        Py_SETREF(result, shifted ? PyNumber_Add(shifted, chunk_obj) : NULL);
+        Py_XDECREF(shifted);
+        Py_DECREF(chunk_obj);
+        if (!result) {
+            goto error;
+        }
+    }
+    Py_DECREF(multiplier);
+    return result;
+
+error:
+    Py_XDECREF(result);
+    Py_XDECREF(multiplier);
+    return NULL;
+}
+
+static PyMethodDef bcid_c_methods[] = {
+    {"base62_encode", base62_encode, METH_O, "Convert a number to base62 string."},
+    {"base62_decode", base62_decode, METH_O, "Convert a base62 string to number."},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef bcid_c_module = {
+    PyModuleDef_HEAD_INIT,
+    "_bcid_c",
+    "Optional C implementations of the bcid base62 primitives.",
+    -1,
+    bcid_c_methods,
+    NULL,
+    NULL,
+    NULL,
+    NULL
+};
+
+PyMODINIT_FUNC PyInit__bcid_c(void) {
+    memset(B62_DECODE, 0xFF, sizeof(B62_DECODE));
+    for (int i = 0; i < 62; i++) {
+        B62_DECODE[(uint8_t)BASE62[i]] = (uint8_t)i;
+    }
+    return PyModule_Create(&bcid_c_module);
+}
@@ -1,32 +1,192 @@
 import time
-import argparse
 import os
 import struct
+import functools
+import threading
 from datetime import datetime, timezone
 import string
 
 # Base62 alphabet (a-zA-Z0-9)
 BASE62 = string.ascii_letters + string.digits
 
-def base62_encode(num):
+# Two-digit lookup: every value below 62**2 = 3844 -> its 2-character base62 encoding ('a'-padded)
+_B62_PAIRS = tuple(high + low for high in BASE62 for low in BASE62)
+
+# Reverse lookup for base62_decode: byte value -> digit value (0xFF marks invalid characters)
+_B62_DECODE = bytearray(b'\xff' * 256)
+for _i, _c in enumerate(BASE62):
+    _B62_DECODE[ord(_c)] = _i
+_B62_DECODE = bytes(_B62_DECODE)
+del _i, _c
+
+# Maps a random byte to a base62 character (byte % 62), for bytes.translate
+_RAND_TRANS = bytes(ord(BASE62[i % 62]) for i in range(256))
+
+# Random bytes are drawn from os.urandom in blocks and handed out per thread. Each thread
+# starts with a small block, so short-lived threads don't pay for a large read, and doubles
+# it on every refill up to the maximum.
+_RAND_BUFFER_MIN = 1024
+_RAND_BUFFER_MAX = 65536
+_rand_state = threading.local()
+
+def _reset_rand_state():
+    """Drops buffered random bytes so a forked child never reuses its parent's randomness."""
+    _rand_state.__dict__.clear()
+
+# Windows has no fork, and no os.register_at_fork either
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_rand_state)
+
+# Hot functions take the module-level names they use as underscore-prefixed, keyword-only
+# default arguments, turning global lookups into local ones. These parameters are not meant
+# to be passed.
+
+def _rand(n, *, _state=_rand_state, _urandom=os.urandom, _min=_RAND_BUFFER_MIN, _max=_RAND_BUFFER_MAX):
+    """Returns n bytes from os.urandom, served from a per-thread buffer to save syscalls."""
+    try:
+        buf = _state.buf
+        pos = _state.pos
+    except AttributeError:
+        buf, pos = b'', 0
+    end = pos + n
+    if end > len(buf):
+        size = min(len(buf) * 2, _max) if buf else _min
+        if n > size:
+            return _urandom(n)
+        buf = _state.buf = _urandom(size)
+        pos, end = 0, n
+    _state.pos = end
+    return buf[pos:end]
+
+def base62_encode(num, *, _pairs=_B62_PAIRS, _zero=BASE62[0], _divmod=divmod):
     """Convert a number to base62 string."""
     if num == 0:
-        return BASE62[0]
+        return _zero
     
+    # Peel off two digits per divmod; pairs come out least significant first
     result = []
+    append = result.append
     while num:
-        num, rem = divmod(num, 62)
-        result.append(BASE62[rem])
-    return ''.join(reversed(result))
+        num, rem = _divmod(num, 3844)
+        append(_pairs[rem])
+    result.reverse()
+    # Drop the padding digit of the topmost pair
+    if result[0][0] == _zero:
+        result[0] = result[0][1]
+    return ''.join(result)
 
-def base62_decode(s):
+def _encode_timestamp(timestamp, *, _pairs=_B62_PAIRS, _digits=BASE62):
+    """Convert a YYYYMMDDHHmmSSmm timestamp to base62 using fixed 9-digit extraction."""
+    # Every timestamp from year 22 onwards needs exactly 9 digits (62**8 <= ts < 10**16 < 62**9)
+    if timestamp < 62 ** 8:
+        return base62_encode(timestamp)
+    
+    # Split into 5 + 4 digit halves so each half stays a single-digit (< 2**30) CPython int,
+    # then extract the digits two at a time through the pair table. Remainders come from
+    # subtracting the quotient's multiple, which avoids building and unpacking divmod tuples.
+    high = timestamp // 14776336  # 62**4
+    low = timestamp - high * 14776336
+    p3 = low // 3844
+    p4 = low - p3 * 3844
+    rest = high // 3844
+    p2 = high - rest * 3844
+    d0 = rest // 3844
+    p1 = rest - d0 * 3844
+    return _digits[d0] + _pairs[p1] + _pairs[p2] + _pairs[p3] + _pairs[p4]
+
+def base62_decode(s, *, _table=_B62_DECODE):
     """Convert a base62 string to number."""
+    digits = s.encode('ascii').translate(_table)
+    if b'\xff' in digits:
+        raise ValueError(f"Invalid base62 string: {s!r}")
     num = 0
-    for char in s:
-        num = num * 62 + BASE62.index(char)
+    for digit in digits:
+        num = num * 62 + digit
     return num
 
-def generate_identifier(prefix, machine_id=1, user_datetime=None, is_random=False):
+def _encode_u16(value, *, _pairs=_B62_PAIRS, _digits=BASE62, _zero=BASE62[0]):
+    """Convert a 16-bit value to its minimal-length base62 string (as base62_encode)."""
+    high = value // 3844
+    pair = _pairs[value - high * 3844]
+    if high:
+        return _digits[high] + pair
+    # Drop the padding digit, as base62_encode does for its topmost pair
+    return pair[1] if pair[0] == _zero else pair
+
+def _encode_u16_padded(value, *, _pairs=_B62_PAIRS, _digits=BASE62):
+    """Convert a 16-bit value to base62, zero-padded to exactly 3 characters."""
+    high = value // 3844
+    return _digits[high] + _pairs[value - high * 3844]
+
+# Use the C implementations of the base62 primitives when the optional extension is built
+try:
+    from _bcid_c import base62_encode, base62_decode
+except ImportError:
+    pass
+else:
+    # base62_encode already produces the minimal-length timestamp encoding
+    _encode_timestamp = base62_encode
+
+# strptime fallbacks for date strings fromisoformat rejects (e.g. non-zero-padded fields)
+_USER_DT_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d')
+
+@functools.lru_cache(maxsize=1024)
+def _parse_user_dt(user_datetime):
+    """
+    Parses a user-supplied date/time string into a UTC datetime.
+
+    Results are memoized, so generating many identifiers for the same event time only parses once.
+    """
+    try:
+        # Try parsing ISO format first; this also covers a trailing 'Z', the space-separated
+        # 'YYYY-MM-DD HH:MM[:SS]' and date-only 'YYYY-MM-DD' forms
+        try:
+            dt = datetime.fromisoformat(user_datetime)
+        except ValueError as iso_error:
+            # Fall back to common date formats
+            for fmt in _USER_DT_FORMATS:
+                try:
+                    dt = datetime.strptime(user_datetime, fmt)
+                    break
+                except ValueError:
+                    continue
+            else:
+                # A 'T'-separated string is meant as ISO 8601, so keep fromisoformat's reason
+                # (e.g. "hour must be in 0..23") rather than the generic message
+                if 'T' in user_datetime:
+                    raise iso_error
+                raise ValueError(f"Unable to parse date string: {user_datetime}") from iso_error
+        
+        # Treat values without timezone info as UTC; 'Z' inputs already come back in UTC
+        if dt.tzinfo is None:
+            return dt.replace(tzinfo=timezone.utc)
+        if dt.tzinfo is timezone.utc:
+            return dt
+        return dt.astimezone(timezone.utc)
+    except ValueError as e:
+        raise ValueError(f"Invalid date format: {e}. Use ISO 8601 format (e.g., '2023-12-25T10:30:00')") from e
+
+def _normalize_user_dt(user_datetime):
+    """Converts a user-supplied datetime or date/time string into a datetime whose fields are in UTC."""
+    if isinstance(user_datetime, str):
+        return _parse_user_dt(user_datetime)
+    if isinstance(user_datetime, datetime):
+        # Only the date/time fields are read, so naive values (taken as UTC) and
+        # values already in UTC are used as-is; other timezones are converted to UTC
+        if user_datetime.tzinfo is not None and user_datetime.tzinfo is not timezone.utc:
+            return user_datetime.astimezone(timezone.utc)
+        return user_datetime
+    raise ValueError("user_datetime must be a datetime object or ISO 8601 string")
+
+def _datetime_timestamp(dt):
+    """Composes the YYYYMMDDHHmmSSmm timestamp directly from a datetime's fields."""
+    return ((((((dt.year * 100 + dt.month) * 100 + dt.day) * 100 + dt.hour) * 100
+              + dt.minute) * 100 + dt.second) * 100 + dt.microsecond // 10000)
+
+def generate_identifier(prefix, machine_id=1, user_datetime=None, is_random=False, *,
+                        _now=datetime.now, _utc=timezone.utc, _timestamp=_datetime_timestamp,
+                        _encode_ts=_encode_timestamp, _encode_u16=_encode_u16, _rand=_rand,
+                        _unpack_u16=struct.Struct('>H').unpack, _trans=_RAND_TRANS):
     """
     Generates a time-orderable, base62 string identifier with a prefix.
 
@@ -49,70 +209,29 @@ def generate_identifier(prefix, machine_id=1, user_datetime=None, is_random=Fals
         return generate_random_identifier(prefix, machine_id)
 
     # Use user-supplied datetime or current UTC time
-    if user_datetime:
-        if isinstance(user_datetime, str):
-            try:
-                # Try parsing ISO format first
-                if 'T' in user_datetime:
-                    dt = datetime.fromisoformat(user_datetime.replace('Z', '+00:00'))
-                else:
-                    # Try common date formats
-                    for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d']:
-                        try:
-                            dt = datetime.strptime(user_datetime, fmt)
-                            break
-                        except ValueError:
-                            continue
-                    else:
-                        raise ValueError(f"Unable to parse date string: {user_datetime}")
-                
-                # Convert to UTC if no timezone info
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                else:
-                    dt = dt.astimezone(timezone.utc)
-            except ValueError as e:
-                raise ValueError(f"Invalid date format: {e}. Use ISO 8601 format (e.g., '2023-12-25T10:30:00')")
-        elif isinstance(user_datetime, datetime):
-            dt = user_datetime
-            # Convert to UTC if no timezone info
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            else:
-                dt = dt.astimezone(timezone.utc)
-        else:
-            raise ValueError("user_datetime must be a datetime object or ISO 8601 string")
-    else:
-        dt = datetime.now(timezone.utc)
+    dt = _normalize_user_dt(user_datetime) if user_datetime else _now(_utc)
 
-    # Get timestamp in YYYYMMDDHHmmSSmmmm format (using UTC)
-    timestamp = int(dt.strftime("%Y%m%d%H%M%S%f")[:16])  # Get first 16 digits (YYYYMMDDHHmmSSmm)
+    # Get timestamp in YYYYMMDDHHmmSSmm format (using UTC)
+    timestamp = _timestamp(dt)
     
     # Generate 16-bit random value
-    random_value = os.urandom(2)
-    random_int = struct.unpack('>H', random_value)[0]
+    random_value = _rand(2)
+    random_int = _unpack_u16(random_value)[0]
     
     # Convert components to base62
-    timestamp_b62 = base62_encode(timestamp)
-    machine_id_b62 = base62_encode(machine_id)
-    random_b62 = base62_encode(random_int)
+    timestamp_b62 = _encode_ts(timestamp)
+    machine_id_b62 = _encode_u16(machine_id)
+    random_b62 = _encode_u16(random_int)
     
-    # Generate additional random bytes and convert to base62
-    random_padding = os.urandom(21)
-    padding_b62 = ''.join(base62_encode(b) for b in random_padding)
+    # Generate exactly as many random base62 characters as needed to reach 28 after the prefix
+    padding_length = 28 - len(timestamp_b62) - len(machine_id_b62) - len(random_b62)
+    padding_b62 = _rand(padding_length).translate(_trans).decode('ascii')
     
-    # Combine all components
-    encoded = timestamp_b62 + machine_id_b62 + random_b62 + padding_b62
-    
-    # Take exactly 28 characters after the prefix
-    encoded = encoded[:28]
-    
-    # Combine prefix with encoded part
-    identifier = prefix + encoded
-    
-    return identifier
+    # Combine prefix with all components
+    return ''.join((prefix, timestamp_b62, machine_id_b62, random_b62, padding_b62))
 
-def generate_random_identifier(prefix, machine_id=1):
+def generate_random_identifier(prefix, machine_id=1, *, _encode_padded=_encode_u16_padded,
+                               _rand=_rand, _trans=_RAND_TRANS):
     """
     Generates a fully random (non-chronological) base62 string identifier with a prefix.
 
@@ -131,23 +250,95 @@ def generate_random_identifier(prefix, machine_id=1):
 
     # Convert machine ID to base62 with fixed length (3 characters)
     # This ensures unambiguous decoding
-    machine_id_b62 = base62_encode(machine_id)
-    padded_machine_id_b62 = machine_id_b62.rjust(3, BASE62[0])  # Pad with 'a' (represents 0)
+    padded_machine_id_b62 = _encode_padded(machine_id)  # Padded with 'a' (represents 0)
     
     # Generate the remaining 25 characters as fully random data
     remaining_length = 28 - len(padded_machine_id_b62)  # Should be 25
     
     # Generate random bytes and convert to base62
-    random_bytes = os.urandom(remaining_length)
-    
-    random_b62 = ''
-    for byte in random_bytes:
-        random_b62 += BASE62[byte % 62]
+    random_b62 = _rand(remaining_length).translate(_trans).decode('ascii')
     
     # Combine prefix with machine ID and random part
     return prefix + padded_machine_id_b62 + random_b62
 
-def decode_identifier(identifier):
+def generate_identifiers(n, prefix, machine_id=1, user_datetime=None, is_random=False, *,
+                         _now=datetime.now, _utc=timezone.utc, _timestamp=_datetime_timestamp,
+                         _encode_ts=_encode_timestamp, _encode_u16=_encode_u16,
+                         _encode_padded=_encode_u16_padded, _rand=_rand, _trans=_RAND_TRANS):
+    """
+    Generates a batch of identifiers, sharing the per-call work across the whole batch.
+
+    Random data for the whole batch is drawn in one go, and the timestamp is only
+    re-encoded when it changes.
+
+    Args:
+        n (int): The number of identifiers to generate.
+        prefix (str): A 4-letter prefix to prepend to each identifier.
+        machine_id (int, optional): A 16-bit machine identifier. Defaults to 1.
+        user_datetime (datetime|str, optional): User-supplied date/time. Defaults to current UTC time.
+        is_random (bool, optional): If True, generates fully random identifiers (ignores user_datetime).
+
+    Returns:
+        list: The generated base62 string identifiers, each exactly 32 characters long.
+    """
+    if len(prefix) != 4:
+        raise ValueError("Prefix must be exactly 4 characters long")
+    
+    if not 0 <= machine_id < 65536:
+        raise ValueError("Machine ID must be between 0 and 65535")
+
+    if n < 0:
+        raise ValueError("Number of identifiers must not be negative")
+
+    if is_random:
+        # Same layout as generate_random_identifier: padded machine ID and 25 random characters
+        head = prefix + _encode_padded(machine_id)
+        random_b62 = _rand(n * 25).translate(_trans).decode('ascii')
+        return [head + random_b62[offset:offset + 25] for offset in range(0, n * 25, 25)]
+
+    user_timestamp = _timestamp(_normalize_user_dt(user_datetime)) if user_datetime else None
+    machine_id_b62 = _encode_u16(machine_id)
+    
+    # Each identifier gets 2 random bytes for the 16-bit random value, followed by room for
+    # the longest possible padding (25 characters, leaving one each for the other components).
+    # The pool is also translated to base62 once so padding is a plain slice.
+    stride = 27
+    pool = _rand(n * stride)
+    pool_b62 = pool.translate(_trans).decode('ascii')
+    
+    last_timestamp = None
+    identifiers = []
+    append = identifiers.append
+    for offset in range(0, n * stride, stride):
+        timestamp = user_timestamp or _timestamp(_now(_utc))
+        if timestamp != last_timestamp:
+            last_timestamp = timestamp
+            head = prefix + _encode_ts(timestamp) + machine_id_b62
+            head_length = len(head)
+        
+        random_b62 = _encode_u16(pool[offset] << 8 | pool[offset + 1])
+        padding_start = offset + 2
+        padding_end = padding_start + 32 - head_length - len(random_b62)
+        append(head + random_b62 + pool_b62[padding_start:padding_end])
+    return identifiers
+
+def _decode_u16_field(encoded, start, *, _zero=BASE62[0], _decode=base62_decode):
+    """
+    Decodes a minimal-length base62 16-bit field (machine ID or random value) at start.
+
+    Returns:
+        tuple: The decoded value and the index just past the field.
+    """
+    # Minimal encodings only start with the zero digit when the value itself is 0
+    if encoded[start:start + 1] == _zero:
+        return 0, start + 1
+    # Take 3 chars unless that exceeds 16 bits; 2 chars (below 62**2) always fit
+    value = _decode(encoded[start:start + 3])
+    if value > 65535:  # Max 16-bit number
+        return value // 62, start + 2
+    return value, start + 3
+
+def decode_identifier(identifier, *, _decode=base62_decode, _decode_u16=_decode_u16_field):
     """
     Decodes a BCID into its component parts.
 
@@ -171,42 +362,19 @@ def decode_identifier(identifier):
     
     try:
         # Try to decode as chronological identifier first
-        # Find the timestamp (it will be the largest number and should represent a valid date)
-        timestamp_str = ''
-        for char in encoded:
-            timestamp_str += char
-            timestamp_value = base62_decode(timestamp_str)
-            if timestamp_value > 9999999999999999:  # Max 16-digit number
-                timestamp_str = timestamp_str[:-1]
-                break
-        
-        timestamp = base62_decode(timestamp_str)
+        # Every timestamp in the accepted year range encodes to exactly 9 base62 digits
+        # (62**8 < 1970 * 10**12 and 2101 * 10**12 < 62**9), so that is the only width to try
+        timestamp = _decode(encoded[:9])
         
         # Check if this looks like a valid timestamp (year should be reasonable)
-        timestamp_str_16 = str(timestamp).zfill(16)
-        year = int(timestamp_str_16[:4])
+        year = timestamp // 10**12
         is_valid_timestamp = 1970 <= year <= 2100
         
         if is_valid_timestamp:
             # Try to decode as chronological identifier
-            # Find the machine_id (next 2-3 chars)
-            machine_id_str = ''
-            for char in encoded[len(timestamp_str):]:
-                machine_id_str += char
-                if base62_decode(machine_id_str) > 65535:  # Max 16-bit number
-                    machine_id_str = machine_id_str[:-1]
-                    break
-            
-            # Find the random value (next 2-3 chars)
-            random_str = ''
-            for char in encoded[len(timestamp_str) + len(machine_id_str):]:
-                random_str += char
-                if base62_decode(random_str) > 65535:  # Max 16-bit number
-                    random_str = random_str[:-1]
-                    break
-            
-            machine_id = base62_decode(machine_id_str)
-            random_value = base62_decode(random_str)
+            # The machine_id and random value follow the timestamp (1-3 chars each)
+            machine_id, machine_id_end = _decode_u16(encoded, 9)
+            random_value, _ = _decode_u16(encoded, machine_id_end)
             
             return {
                 'prefix': prefix,
@@ -219,7 +387,7 @@ def decode_identifier(identifier):
             # Decode as random identifier
             # Machine ID is always encoded as exactly 3 characters (padded with 'a' if needed)
             machine_id_str = encoded[:3]
-            machine_id = base62_decode(machine_id_str)
+            machine_id = _decode(machine_id_str)
             random_part = encoded[3:]
             
             return {
@@ -232,6 +400,9 @@ def decode_identifier(identifier):
         raise ValueError(f"Invalid encoding: {e}")
 
 if __name__ == "__main__":
+    # Only needed for the command line; keep it out of library imports
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Generate or decode a time-orderable, base62 string identifier.")
     parser.add_argument("-p", "--prefix", type=str,
                         help="The 4-letter prefix to prepend to the identifier")
@@ -0,0 +1,174 @@
+"""Tests for identifier generation and decoding."""
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+from bcid import (
+    _RAND_BUFFER_MAX,
+    _RAND_BUFFER_MIN,
+    _datetime_timestamp,
+    _rand,
+    _rand_state,
+    _reset_rand_state,
+    decode_identifier,
+    generate_identifier,
+    generate_identifiers,
+)
+
+# Encodes to 3 base62 characters with a non-zero leading one, so it decodes unambiguously
+MACHINE_ID = 12345
+
+# 0, 1, and enough identifiers that the 27-byte-per-identifier pool bypasses the _rand buffer
+BATCH_SIZES = [0, 1, 65536 // 27 + 1]
+
+
+def _now_timestamp():
+    return _datetime_timestamp(datetime.now(timezone.utc))
+
+
+@pytest.mark.parametrize("n", BATCH_SIZES)
+def test_chronological_batch(n):
+    before = _now_timestamp()
+    identifiers = generate_identifiers(n, 'TEST', machine_id=MACHINE_ID)
+    after = _now_timestamp()
+
+    assert len(identifiers) == n
+    assert len(set(identifiers)) == n
+    for identifier in identifiers:
+        assert len(identifier) == 32
+        assert identifier.startswith('TEST')
+        components = decode_identifier(identifier)
+        assert components['type'] == 'chronological'
+        assert components['machine_id'] == MACHINE_ID
+        assert before <= components['timestamp'] <= after
+
+
+@pytest.mark.parametrize("n", BATCH_SIZES)
+def test_random_batch(n):
+    identifiers = generate_identifiers(n, 'TEST', machine_id=MACHINE_ID, is_random=True)
+
+    assert len(identifiers) == n
+    assert len(set(identifiers)) == n
+    for identifier in identifiers:
+        assert len(identifier) == 32
+        assert identifier.startswith('TEST')
+        components = decode_identifier(identifier)
+        assert components['type'] == 'random'
+        assert components['machine_id'] == MACHINE_ID
+
+
+@pytest.mark.parametrize("user_datetime", [
+    '2023-12-25T10:30:00.123Z',
+    datetime(2023, 12, 25, 10, 30, 0, 123000),
+])
+def test_user_datetime_keeps_timestamp_fixed(user_datetime):
+    identifiers = generate_identifiers(500, 'TEST', machine_id=MACHINE_ID, user_datetime=user_datetime)
+
+    assert len(set(identifiers)) == 500
+    for identifier in identifiers:
+        assert len(identifier) == 32
+        components = decode_identifier(identifier)
+        assert components['timestamp'] == 2023122510300012
+        assert components['machine_id'] == MACHINE_ID
+
+
+def test_negative_count_rejected():
+    with pytest.raises(ValueError):
+        generate_identifiers(-1, 'TEST')
+
+
+# 0 encodes to a single character, 3844 is the first 3-character value and 65535 the last
+@pytest.mark.parametrize("machine_id", [0, 3844, 65535])
+@pytest.mark.parametrize("user_datetime, timestamp", [
+    ('1970-01-01T00:00:00', 1970010100000000),
+    ('2023-12-25T10:30:00.12Z', 2023122510300012),
+    ('2100-12-31T23:59:59.99', 2100123123595999),
+])
+def test_chronological_round_trip(machine_id, user_datetime, timestamp):
+    for _ in range(200):
+        components = decode_identifier(generate_identifier('TEST', machine_id, user_datetime))
+        assert components['type'] == 'chronological'
+        assert components['timestamp'] == timestamp
+        assert components['machine_id'] == machine_id
+        assert 0 <= components['random'] <= 65535
+
+
+@pytest.mark.parametrize("machine_id", [0, 3844, 65535])
+def test_random_round_trip(machine_id):
+    for _ in range(200):
+        identifier = generate_identifier('TEST', machine_id, is_random=True)
+        components = decode_identifier(identifier)
+        assert components['type'] == 'random'
+        assert components['machine_id'] == machine_id
+        assert components['random_part'] == identifier[7:]
+
+
+def test_small_machine_id_random_identifier_not_read_as_chronological():
+    # Its first 9 characters decode to a year before 1970 rather than being scanned for a wider timestamp
+    assert decode_identifier('TESTajc03O9i6kIQCIZthz7IgjuN9Thf') == {
+        'prefix': 'TEST',
+        'machine_id': 560,
+        'random_part': '03O9i6kIQCIZthz7IgjuN9Thf',
+        'type': 'random',
+    }
+
+
+@pytest.mark.parametrize("position", range(9))
+def test_invalid_timestamp_character_rejected(position):
+    identifier = generate_identifier('TEST', 1, '2023-12-25T10:30:00')
+    index = 4 + position
+    with pytest.raises(ValueError, match="Invalid encoding"):
+        decode_identifier(identifier[:index] + '-' + identifier[index + 1:])
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires os.fork")
+def test_forked_child_does_not_reuse_parent_random_bytes():
+    _rand(1)  # Make sure the parent has a partly used buffer to inherit
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.write(write_fd, _rand(16))
+        finally:
+            os._exit(0)
+    os.close(write_fd)
+    parent_bytes = _rand(16)
+    with os.fdopen(read_fd, 'rb') as pipe:
+        child_bytes = pipe.read()
+    os.waitpid(pid, 0)
+    assert len(child_bytes) == 16
+    assert child_bytes != parent_bytes
+
+
+def test_rand_larger_than_block_leaves_buffer_alone():
+    _reset_rand_state()
+    _rand(1)
+    buf, pos = _rand_state.buf, _rand_state.pos
+    assert len(buf) == _RAND_BUFFER_MIN
+
+    data = _rand(_RAND_BUFFER_MAX + 1)
+    assert len(data) == _RAND_BUFFER_MAX + 1
+    assert buf[pos:] not in data
+    assert _rand_state.buf is buf
+    assert _rand_state.pos == pos
+
+
+def test_rand_block_grows_up_to_maximum():
+    _reset_rand_state()
+    sizes = []
+    for _ in range(10):
+        _rand(1)
+        sizes.append(len(_rand_state.buf))
+        _rand(len(_rand_state.buf) - _rand_state.pos)  # Use up the block so the next call refills
+    assert sizes == [min(_RAND_BUFFER_MIN << i, _RAND_BUFFER_MAX) for i in range(10)]
+
+
+@pytest.mark.parametrize("user_datetime, reason", [
+    ('2023-12-25T24:00:00', "hour must be in 0..23"),
+    ('2023-02-30T10:30:00', "day is out of range for month"),
+    ('garbage', "Unable to parse date string: garbage"),
+])
+def test_invalid_user_datetime_reports_reason(user_datetime, reason):
+    with pytest.raises(ValueError, match=f"Invalid date format: {reason}"):
+        generate_identifier('TEST', 1, user_datetime)
@@ -0,0 +1,61 @@
+"""Checks that the optional _bcid_c extension matches the pure-Python base62 functions."""
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+_bcid_c = pytest.importorskip("_bcid_c")
+
+# Values around the 64-bit limit and the 10-digit chunk size used by the extension
+EDGE_VALUES = sorted(
+    {value for exponent in range(321) for value in (2**exponent - 1, 2**exponent, 2**exponent + 1)}
+    | {value for exponent in range(55) for value in (62**exponent - 1, 62**exponent, 62**exponent + 1)}
+)
+
+
+@pytest.fixture(scope="module")
+def pure():
+    """bcid.py loaded with the extension import blocked, so it keeps its Python functions."""
+    saved = sys.modules.get("_bcid_c")
+    sys.modules["_bcid_c"] = None
+    try:
+        spec = importlib.util.spec_from_file_location("bcid_pure", Path(__file__).with_name("bcid.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        sys.modules["_bcid_c"] = saved
+    assert module.base62_encode is not _bcid_c.base62_encode
+    return module
+
+
+def test_edge_values_match(pure):
+    for value in EDGE_VALUES:
+        encoded = pure.base62_encode(value)
+        assert _bcid_c.base62_encode(value) == encoded, value
+        assert _bcid_c.base62_decode(encoded) == value, value
+
+
+def test_random_ints_match(pure):
+    rng = random.Random(62)
+    for _ in range(20000):
+        value = rng.getrandbits(rng.randint(1, 300))
+        encoded = pure.base62_encode(value)
+        assert _bcid_c.base62_encode(value) == encoded, value
+        assert _bcid_c.base62_decode(encoded) == value, value
+
+
+def test_random_strings_match(pure):
+    rng = random.Random(26)
+    for _ in range(5000):
+        s = ''.join(rng.choice(pure.BASE62) for _ in range(rng.randint(0, 60)))
+        assert _bcid_c.base62_decode(s) == pure.base62_decode(s), s
+
+
+@pytest.mark.parametrize("s", ["a-b", "-", " ", "abcdefghijk-", "é", "abc\x00"])
+def test_invalid_strings_rejected(pure, s):
+    with pytest.raises(ValueError):
+        pure.base62_decode(s)
+    with pytest.raises(ValueError):
+        _bcid_c.base62_decode(s)